@@ -16,12 +16,15 @@ dashboard_branches = {
     89: 'Medina Downtown'
 }
 
+# One-time index build: O(1) branch lookups instead of a full-column
+# boolean scan per branch
+branch_rows = df.drop_duplicates('BranchId').set_index('BranchId')
+
 print('\nDASHBOARD BRANCHES:')
 print('-'*70)
 for branch_id, name in dashboard_branches.items():
-    row = df[df['BranchId'] == branch_id]
-    if len(row) > 0:
-        r = row.iloc[0]
+    if branch_id in branch_rows.index:
+        r = branch_rows.loc[branch_id]
         total = r['total_vehicles']
         rented = r['rented_vehicles']
         available = r['available_vehicles']
@@ -44,8 +47,14 @@ print(f'Median utilization: {df["utilization_pct"].median():.1f}%')
 print('\nBRANCHES WITH LOW UTILIZATION (<30%):')
 low = df[df['utilization_pct'] < 30]
 print(f'Count: {len(low)}')
-for _, r in low.iterrows():
-    print(f'  Branch {r["BranchId"]}: {r["utilization_pct"]}% ({r["rented_vehicles"]}/{r["total_vehicles"]})')
+# Build all the lines with vectorized string ops instead of formatting
+# row by row through iterrows
+if len(low) > 0:
+    lines = ('  Branch ' + low['BranchId'].astype(str) + ': '
+             + low['utilization_pct'].astype(str) + '% ('
+             + low['rented_vehicles'].astype(str) + '/'
+             + low['total_vehicles'].astype(str) + ')')
+    print('\n'.join(lines))
 
 print('\n' + '='*70)
 print('EXPORT DATE:', df['export_date'].iloc[0] if 'export_date' in df.columns else 'Unknown')
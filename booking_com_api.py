@@ -3,8 +3,18 @@ Real-time competitor pricing using Booking.com API via RapidAPI
 API: booking-com.p.rapidapi.com
 """
 import requests
+import requests.adapters
 import json
 from datetime import datetime, timedelta
+
+# orjson parses the large car-search payloads several times faster than
+# the stdlib parser behind response.json()
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+from functools import lru_cache
 from typing import Dict, List, Optional
 import logging
 from car_model_category_mapping import get_correct_category, CAR_MODEL_MAPPING
@@ -19,7 +29,29 @@ class BookingComCarRentalAPI:
         self.api_key = "2d4ad88e62mshfb8fb27c0b4e2f8p1fbb48jsn854faa573903"
         self.api_host = "booking-com.p.rapidapi.com"
         self.base_url = f"https://{self.api_host}/v1/car-rental"
-        
+
+        # Persistent session: one TCP+TLS handshake reused across all
+        # branch/category calls instead of a fresh connection per request,
+        # with a pool large enough for the concurrent branch scrape
+        self.session = requests.Session()
+        self.session.headers.update({
+            "x-rapidapi-host": self.api_host,
+            "x-rapidapi-key": self.api_key
+        })
+        # Retry throttles/transient server errors with exponential backoff
+        # (2s, 4s, 8s...) instead of failing the branch outright; 429
+        # Retry-After headers are honoured by urllib3
+        retry = requests.adapters.Retry(
+            total=4,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"]
+        )
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=16, pool_maxsize=64, max_retries=retry
+        )
+        self.session.mount("https://", adapter)
+
         # Map Renty categories to Booking.com categories
         self.category_mapping = {
             "Economy": ["Economy", "Mini"],
@@ -79,12 +111,7 @@ class BookingComCarRentalAPI:
             return []
         
         url = f"{self.base_url}/search"
-        
-        headers = {
-            "x-rapidapi-host": self.api_host,
-            "x-rapidapi-key": self.api_key
-        }
-        
+
         # Format datetime as "YYYY-MM-DD HH:MM:SS"
         pick_up_str = pick_up_date.strftime("%Y-%m-%d 10:00:00")
         drop_off_str = drop_off_date.strftime("%Y-%m-%d 10:00:00")
@@ -104,11 +131,14 @@ class BookingComCarRentalAPI:
         
         try:
             logger.info(f"Searching car rentals for {branch_name} ({coords['lat']}, {coords['lon']})")
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = self.session.get(url, params=params, timeout=30)
             
             if response.status_code == 200:
-                data = response.json()
-                
+                if HAS_ORJSON:
+                    data = orjson.loads(response.content)
+                else:
+                    data = response.json()
+
                 if 'search_results' in data:
                     results = data['search_results']
                     logger.info(f"Found {len(results)} car rental options for {branch_name}")
@@ -253,15 +283,12 @@ class BookingComCarRentalAPI:
         return dashboard_data
 
 
-# Singleton instance
-_api_instance = None
-
+# Singleton instance (cached so the session and its connection pool are
+# shared by every caller in the process)
+@lru_cache(maxsize=1)
 def get_api_instance():
     """Get or create BookingComCarRentalAPI instance"""
-    global _api_instance
-    if _api_instance is None:
-        _api_instance = BookingComCarRentalAPI()
-    return _api_instance
+    return BookingComCarRentalAPI()
 
 
 # Main function for dashboard integration
@@ -5,6 +5,7 @@ Based on industry standards and actual vehicle specifications
 This mapping is used to correctly categorize competitor vehicles from the API
 into Renty's category system.
 """
+import re
 
 # Comprehensive car model mapping
 # Format: "Vehicle Name": {"renty_category": "Category", "type": "Type", "notes": "Additional info"}
@@ -357,6 +358,30 @@ BOOKING_CATEGORY_MAPPING = {
     "Premium SUV": "Luxury SUV",
 }
 
+# Precomputed lookup structures so get_correct_category does not rebuild
+# them per call: lowercased name -> category for O(1) exact matches, and a
+# single compiled alternation (longest names first) replacing the Python
+# loop over every known model for partial matches
+_CATEGORY_BY_LOWER_NAME = {
+    name.lower(): mapping["renty_category"]
+    for name, mapping in CAR_MODEL_MAPPING.items()
+}
+_MODEL_NAME_RE = re.compile(
+    '|'.join(
+        re.escape(name.lower())
+        for name in sorted(CAR_MODEL_MAPPING, key=len, reverse=True)
+    )
+)
+
+# Keyword sets used by the NEEDS_MODEL_CHECK fallback, hoisted out of the
+# function body
+_SUV_INDICATORS = ("SUV", "CRUISER", "PATROL", "TAHOE", "HIGHLANDER", "PRADO",
+                   "X1", "X2", "X3", "X4", "X5", "X6", "X7", "GLE", "Q7")
+_LARGE_SUV_INDICATORS = ("LAND CRUISER", "PATROL", "TAHOE", "HIGHLANDER")
+_LUXURY_SUV_MODELS = ("X1", "X2", "X3", "X4", "X5", "X6", "X7",
+                      "GLE", "GLC", "Q3", "Q5", "Q7", "Q8")
+
+
 def get_correct_category(vehicle_name: str, booking_category: str) -> str:
     """
     Get the correct Renty category for a vehicle
@@ -370,15 +395,17 @@ def get_correct_category(vehicle_name: str, booking_category: str) -> str:
     """
     # First, try exact match on vehicle name
     vehicle_clean = vehicle_name.strip()
-    
-    if vehicle_clean in CAR_MODEL_MAPPING:
-        return CAR_MODEL_MAPPING[vehicle_clean]["renty_category"]
-    
+    vehicle_lower = vehicle_clean.lower()
+
+    if vehicle_lower in _CATEGORY_BY_LOWER_NAME:
+        return _CATEGORY_BY_LOWER_NAME[vehicle_lower]
+
     # Try partial match (e.g., "Hyundai Elantra  " matches "Hyundai Elantra")
-    for model_name, mapping in CAR_MODEL_MAPPING.items():
-        if model_name.lower() in vehicle_clean.lower():
-            return mapping["renty_category"]
-    
+    # via one compiled alternation scan instead of a loop over every model
+    partial = _MODEL_NAME_RE.search(vehicle_lower)
+    if partial:
+        return _CATEGORY_BY_LOWER_NAME[partial.group(0)]
+
     # Fall back to booking category if available
     if booking_category in BOOKING_CATEGORY_MAPPING:
         mapped = BOOKING_CATEGORY_MAPPING[booking_category]
@@ -386,13 +413,12 @@ def get_correct_category(vehicle_name: str, booking_category: str) -> str:
         # If needs model check, make best guess
         if mapped == "NEEDS_MODEL_CHECK":
             # Check if it's an SUV
-            if any(suv_indicator in vehicle_clean.upper() for suv_indicator in 
-                   ["SUV", "CRUISER", "PATROL", "TAHOE", "HIGHLANDER", "PRADO", "X1", "X2", "X3", "X4", "X5", "X6", "X7", "GLE", "Q7"]):
+            vehicle_upper = vehicle_clean.upper()
+            if any(suv_indicator in vehicle_upper for suv_indicator in _SUV_INDICATORS):
                 # Determine size
-                if any(large in vehicle_clean.upper() for large in 
-                       ["LAND CRUISER", "PATROL", "TAHOE", "HIGHLANDER"]):
+                if any(large in vehicle_upper for large in _LARGE_SUV_INDICATORS):
                     return "SUV Large"
-                elif any(x in vehicle_clean for x in ["X1", "X2", "X3", "X4", "X5", "X6", "X7", "GLE", "GLC", "Q3", "Q5", "Q7", "Q8"]):
+                elif any(x in vehicle_clean for x in _LUXURY_SUV_MODELS):
                     return "Luxury SUV"
                 else:
                     return "SUV Standard"
@@ -41,7 +41,12 @@ def load_competitor_prices(file_path: str = "data/competitor_prices/competitor_p
     try:
         df = pd.read_csv(file_path)
         df['Date'] = pd.to_datetime(df['Date'])
-        
+
+        # Low-cardinality string columns as categoricals: filters and
+        # groupbys compare integer codes instead of Python strings
+        for col in ('Category', 'Competitor_Name', 'Branch_City'):
+            df[col] = df[col].astype('category')
+
         logger.info(f"✓ Loaded {len(df)} competitor price points")
         logger.info(f"  Competitors: {df['Competitor_Name'].unique().tolist()}")
         logger.info(f"  Categories: {df['Category'].unique().tolist()}")
@@ -103,7 +108,9 @@ def get_default_competitor_prices() -> pd.DataFrame:
     
     df = pd.DataFrame(data)
     df['Date'] = pd.to_datetime(df['Date'])
-    
+    for col in ('Category', 'Competitor_Name', 'Branch_City'):
+        df[col] = df[col].astype('category')
+
     return df
 
 
@@ -4,11 +4,40 @@ Fetches all competitor prices for all branches and categories from Booking.com A
 Stores in a single JSON file for dashboard consumption
 Run this script once daily (e.g., via scheduled task at midnight)
 """
+import hashlib
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from booking_com_api import get_api_instance
 import logging
 
+# orjson serializes to UTF-8 bytes in C, ~10x faster than stdlib json;
+# fall back to stdlib when it is not installed
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# msgspec provides a compact MessagePack sidecar the dashboard can parse
+# much faster than the pretty JSON (which stays for humans)
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
+
+# On-disk response cache: re-runs within the same scrape date (e.g. after a
+# mid-run failure) skip branches that were already fetched successfully
+try:
+    import diskcache
+    HAS_DISKCACHE = True
+except ImportError:
+    HAS_DISKCACHE = False
+
+CACHE_TTL_SECONDS = 86400  # one scrape cycle
+_cache = diskcache.Cache("data/.scrape_cache") if HAS_DISKCACHE else None
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
@@ -39,10 +68,13 @@ CATEGORIES = [
     "Luxury SUV"
 ]
 
-def scrape_all_competitor_prices():
+def scrape_all_competitor_prices(force=False):
     """
     Scrape competitor prices for all branches and categories
     Returns a dictionary with all data
+
+    Args:
+        force: Bypass the on-disk cache and re-fetch every branch
     """
     api = get_api_instance()
     
@@ -56,45 +88,75 @@ def scrape_all_competitor_prices():
     logger.info(f"Categories: {len(CATEGORIES)}")
     logger.info("="*70)
     
+    # One timestamp per scrape; every branch in a run shares it anyway
+    now_iso = datetime.now().isoformat()
+
     all_data = {
-        "scrape_timestamp": datetime.now().isoformat(),
+        "scrape_timestamp": now_iso,
         "scrape_date": scrape_date.strftime('%Y-%m-%d'),
         "branches": {}
     }
     
     success_count = 0
     fail_count = 0
-    
-    for branch in BRANCHES:
-        logger.info(f"\nScraping: {branch}")
-        
-        try:
-            # Get all category prices for this branch (single API call)
-            branch_data = api.get_competitor_prices_for_dashboard(branch, scrape_date)
-            
-            all_data["branches"][branch] = {
-                "categories": branch_data,
-                "last_updated": datetime.now().isoformat()
-            }
-            
-            # Count competitors found
-            total_competitors = sum(
-                len(cat_data.get('competitors', [])) 
-                for cat_data in branch_data.values()
-            )
-            
-            logger.info(f"  ✓ Success: {len(branch_data)} categories, {total_competitors} total competitors")
-            success_count += 1
-            
-        except Exception as e:
-            logger.error(f"  ✗ Failed: {str(e)}")
-            all_data["branches"][branch] = {
-                "categories": {},
-                "last_updated": datetime.now().isoformat(),
-                "error": str(e)
-            }
-            fail_count += 1
-    
+
+    def fetch_branch(branch):
+        """Fetch one branch, serving from the on-disk cache when possible"""
+        cache_key = f"booking:{branch}:{scrape_date.strftime('%Y-%m-%d')}"
+        if _cache is not None and not force:
+            cached = _cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"  (cache hit) {branch}")
+                return cached
+        branch_data = api.get_competitor_prices_for_dashboard(branch, scrape_date)
+        if _cache is not None and branch_data:
+            _cache.set(cache_key, branch_data, expire=CACHE_TTL_SECONDS)
+        return branch_data
+
+    # Scrape all branches concurrently: each branch is one independent API
+    # round trip, so total wall time becomes the slowest branch instead of
+    # the sum of all eight
+    with ThreadPoolExecutor(max_workers=len(BRANCHES)) as executor:
+        futures = {
+            executor.submit(fetch_branch, branch): branch
+            for branch in BRANCHES
+        }
+
+        for future in as_completed(futures):
+            branch = futures[future]
+
+            try:
+                # Get all category prices for this branch (single API call)
+                branch_data = future.result()
+
+                all_data["branches"][branch] = {
+                    "categories": branch_data,
+                    "last_updated": now_iso
+                }
+
+                # Count competitors found
+                total_competitors = sum(
+                    len(cat_data.get('competitors', []))
+                    for cat_data in branch_data.values()
+                )
+
+                logger.info(f"  ✓ {branch}: {len(branch_data)} categories, {total_competitors} total competitors")
+                success_count += 1
+
+            except Exception as e:
+                logger.error(f"  ✗ {branch} failed: {str(e)}")
+                all_data["branches"][branch] = {
+                    "categories": {},
+                    "last_updated": now_iso,
+                    "error": str(e)
+                }
+                fail_count += 1
+
+    # Keep the stored file deterministic regardless of completion order
+    all_data["branches"] = {
+        branch: all_data["branches"][branch] for branch in BRANCHES
+    }
+
     logger.info("\n" + "="*70)
     logger.info(f"Scrape complete!")
     logger.info(f"Success: {success_count}/{len(BRANCHES)} branches")
@@ -103,27 +165,118 @@ def scrape_all_competitor_prices():
     
     return all_data
 
+def price_digest(branches):
+    """
+    Content hash of the scraped prices themselves. Per-run timestamps
+    (last_updated, competitor Date) are excluded so two scrapes that saw
+    the same market hash identically.
+    """
+    canonical = {
+        branch: {
+            cat: {
+                "avg_price": cat_data.get("avg_price"),
+                "competitors": [
+                    {k: v for k, v in comp.items() if k != "Date"}
+                    for comp in cat_data.get("competitors", [])
+                ]
+            }
+            for cat, cat_data in info.get("categories", {}).items()
+        }
+        for branch, info in branches.items()
+    }
+    canon_bytes = json.dumps(canonical, sort_keys=True,
+                             ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(canon_bytes).hexdigest()
+
 def save_to_file(data, filepath="data/competitor_prices/daily_competitor_prices.json"):
     """Save scraped data to JSON file"""
+    import gzip
     import os
-    
+
     # Ensure directory exists
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    
+
+    # Skip the full artifact rewrite when nothing priced differently since
+    # the previous scrape - downstream syncs/caches then see stable mtimes
+    # and only the tiny delta file changes
+    digest = price_digest(data.get("branches", {}))
+    prev_digest = None
+    if os.path.exists(filepath):
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                prev_digest = json.load(f).get('__digest')
+        except Exception:
+            pass
+
+    delta_path = os.path.splitext(filepath)[0] + '_delta.json'
+    delta = {
+        "unchanged": prev_digest == digest,
+        "digest": digest,
+        "scrape_timestamp": data.get("scrape_timestamp")
+    }
+    with open(delta_path, 'w', encoding='utf-8') as f:
+        json.dump(delta, f, separators=(',', ':'))
+
+    if prev_digest == digest:
+        logger.info(f"\nPrices unchanged since previous scrape (digest {digest[:12]}...) - "
+                    f"kept existing {filepath}")
+        return
+
+    data['__digest'] = digest
+
+    # Compact encoding: the dashboard is the only regular reader, and
+    # dropping indent whitespace halves the bytes written and synced
+    if HAS_ORJSON:
+        # orjson serializes to UTF-8 bytes directly, no intermediate str
+        payload = orjson.dumps(data)
+    else:
+        payload = json.dumps(data, ensure_ascii=False,
+                             separators=(',', ':')).encode('utf-8')
+
+    # Write-then-rename so the dashboard never reads a half-written file
+    # if the scraper crashes mid-write (os.replace is atomic on POSIX)
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, filepath)
+
     logger.info(f"\nData saved to: {filepath}")
-    
+
+    # Human-readable copy only when debugging
+    if os.environ.get('DEBUG') == '1':
+        pretty_path = os.path.splitext(filepath)[0] + '_pretty.json'
+        if HAS_ORJSON:
+            pretty = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            pretty = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        with open(pretty_path, 'wb') as f:
+            f.write(pretty)
+        logger.info(f"Pretty copy saved to: {pretty_path}")
+
+    # Gzipped copy for syncing/archiving - ~5x smaller than the pretty
+    # JSON at negligible CPU cost with compresslevel=3
+    gz_path = filepath + '.gz'
+    with gzip.open(gz_path + '.tmp', 'wb', compresslevel=3) as f:
+        f.write(payload)
+    os.replace(gz_path + '.tmp', gz_path)
+
+    # Compact MessagePack sidecar for the dashboard (JSON kept for humans)
+    if HAS_MSGSPEC:
+        msgpack_path = os.path.splitext(filepath)[0] + '.msgpack'
+        with open(msgpack_path + '.tmp', 'wb') as f:
+            f.write(msgspec.msgpack.encode(data))
+        os.replace(msgpack_path + '.tmp', msgpack_path)
+        logger.info(f"MessagePack sidecar saved to: {msgpack_path}")
+
     # Calculate file size
     file_size = os.path.getsize(filepath) / 1024  # KB
     logger.info(f"File size: {file_size:.2f} KB")
 
-def main():
+def main(force=False):
     """Main execution"""
     try:
         # Scrape all data
-        data = scrape_all_competitor_prices()
+        data = scrape_all_competitor_prices(force=force)
         
         # Save to file
         save_to_file(data)
@@ -140,5 +293,10 @@ def main():
         return False
 
 if __name__ == "__main__":
-    success = main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Daily competitor price scraper")
+    parser.add_argument('--force', action='store_true',
+                        help="Bypass the on-disk cache and re-fetch all branches")
+    args = parser.parse_args()
+    success = main(force=args.force)
     exit(0 if success else 1)
@@ -3,12 +3,30 @@ Daily Kayak Competitor Price Scraper
 Fetches all competitor prices for all branches and categories once daily
 Stores results in JSON file for fast dashboard access
 """
+import gzip
+import hashlib
 import json
 import logging
+import os
+import msgspec
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, date, timedelta
 from pathlib import Path
+from typing import Dict, List, Optional
 from kayak_api import get_kayak_client
 
+# On-disk response cache: re-runs within the same scrape date (e.g. after a
+# mid-run failure) skip branches that were already fetched successfully
+try:
+    import diskcache
+    HAS_DISKCACHE = True
+except ImportError:
+    HAS_DISKCACHE = False
+
+CACHE_TTL_SECONDS = 86400  # one scrape cycle
+_cache = diskcache.Cache("data/.scrape_cache") if HAS_DISKCACHE else None
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(levelname)s:%(name)s:%(message)s'
@@ -31,13 +49,89 @@ BRANCHES = {
     "Jeddah City Center": {"city": "Jeddah", "name": "Jeddah City Center"}
 }
 
-def scrape_all_branches():
+
+# Fixed-schema msgspec.Struct models for the scraped data: C-defined slots
+# instead of one hash table per record, and msgspec encodes them to
+# JSON/MessagePack far faster than dict-of-dicts
+class Competitor(msgspec.Struct):
+    Competitor_Name: str
+    Competitor_Price: float
+    Date: str
+    Vehicle: str
+
+
+class CategoryStats(msgspec.Struct):
+    avg_price: Optional[float]
+    min_price: Optional[float]
+    max_price: Optional[float]
+    competitors: List[Competitor]
+
+
+class Location(msgspec.Struct):
+    city: str
+    name: str
+
+
+class BranchResult(msgspec.Struct, omit_defaults=True):
+    categories: Dict[str, CategoryStats]
+    last_updated: str
+    location: Location
+    error: Optional[str] = None
+
+
+class RentalPeriod(msgspec.Struct):
+    pickup: str
+    dropoff: str
+    days: int
+
+
+class ScrapeResults(msgspec.Struct, omit_defaults=True):
+    scrape_timestamp: str
+    scrape_date: str
+    rental_period: RentalPeriod
+    branches: Dict[str, BranchResult]
+    digest: Optional[str] = msgspec.field(default=None, name="__digest")
+
+
+def price_digest(branches: Dict[str, BranchResult]) -> str:
+    """
+    Content hash of the scraped prices themselves. Per-run timestamps
+    (last_updated, competitor Date) are excluded so two scrapes that saw
+    the same market hash identically.
+    """
+    canonical = {
+        branch: {
+            cat: {
+                "avg_price": stats.avg_price,
+                "competitors": [
+                    (c.Competitor_Name, c.Competitor_Price, c.Vehicle)
+                    for c in stats.competitors
+                ]
+            }
+            for cat, stats in result.categories.items()
+        }
+        for branch, result in branches.items()
+    }
+    canon_bytes = json.dumps(canonical, sort_keys=True,
+                             ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(canon_bytes).hexdigest()
+
+def scrape_all_branches(force=False):
     """
     Scrape competitor prices from Kayak for all branches and categories
+
+    Args:
+        force: Bypass the on-disk cache and re-fetch every branch
     """
     scrape_date = date.today()
     tomorrow = scrape_date + timedelta(days=1)
     day_after = tomorrow + timedelta(days=2)
+
+    # Formatted once per scrape; strftime per competitor record adds up fast,
+    # and every branch in one run shares the same timestamps anyway
+    now = datetime.now()
+    now_iso = now.isoformat()
+    now_str = now.strftime('%Y-%m-%d %H:%M')
     
     logger.info("="*70)
     logger.info("Starting daily Kayak competitor price scrape")
@@ -49,88 +143,129 @@ def scrape_all_branches():
     kayak_client = get_kayak_client()
     
     # Store results
-    results = {
-        "scrape_timestamp": datetime.now().isoformat(),
-        "scrape_date": scrape_date.isoformat(),
-        "rental_period": {
-            "pickup": tomorrow.isoformat(),
-            "dropoff": day_after.isoformat(),
-            "days": 2
-        },
-        "branches": {}
-    }
+    results = ScrapeResults(
+        scrape_timestamp=now_iso,
+        scrape_date=scrape_date.isoformat(),
+        rental_period=RentalPeriod(
+            pickup=tomorrow.isoformat(),
+            dropoff=day_after.isoformat(),
+            days=2
+        ),
+        branches={}
+    )
     
     successful_branches = 0
     failed_branches = []
-    
+
+    def fetch_branch(branch_name):
+        """Fetch one branch, serving from the on-disk cache when possible"""
+        cache_key = f"kayak:{branch_name}:{scrape_date.isoformat()}"
+        if _cache is not None and not force:
+            cached = _cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"  (cache hit) {branch_name}")
+                return cached
+        category_prices = kayak_client.search_cars(branch_name, tomorrow, day_after)
+        if _cache is not None and category_prices:
+            _cache.set(cache_key, category_prices, expire=CACHE_TTL_SECONDS)
+        return category_prices
+
+    # Fetch all branches concurrently: each branch is one independent Kayak
+    # round trip, so total wall time becomes the slowest branch instead of
+    # the sum of all of them. A failed fetch is kept as its exception so
+    # one bad branch cannot abort the whole scrape
+    fetched = {}
+    with ThreadPoolExecutor(max_workers=len(BRANCHES)) as executor:
+        futures = {executor.submit(fetch_branch, branch): branch
+                   for branch in BRANCHES}
+        for future in as_completed(futures):
+            branch = futures[future]
+            try:
+                fetched[branch] = future.result()
+            except Exception as e:
+                fetched[branch] = e
+
     for branch_name, branch_info in BRANCHES.items():
-        logger.info(f"\nScraping: {branch_name}")
-        
+        logger.info(f"\nProcessing: {branch_name}")
+
         try:
-            # Get all categories for this branch
-            category_prices = kayak_client.search_cars(branch_name, tomorrow, day_after)
-            
+            # All categories for this branch (fetched above); a stored
+            # fetch exception takes the error path below like a direct
+            # search_cars failure used to
+            category_prices = fetched[branch_name]
+            if isinstance(category_prices, Exception):
+                raise category_prices
+
             # Format results
-            branch_data = {
-                "categories": {},
-                "last_updated": datetime.now().isoformat(),
-                "location": {
-                    "city": branch_info.get("city", ""),
-                    "name": branch_info.get("name", "")
-                }
-            }
-            
+            branch_data = BranchResult(
+                categories={},
+                last_updated=now_iso,
+                location=Location(
+                    city=branch_info.get("city", ""),
+                    name=branch_info.get("name", "")
+                )
+            )
+
+            # Counted while the categories are built - no second walk over
+            # the structs just to log totals
+            populated_cats = 0
             total_competitors = 0
-            
+
             for category, prices in category_prices.items():
                 if prices:
                     # Format competitor data
                     competitors = [
-                        {
-                            "Competitor_Name": p['supplier'],
-                            "Competitor_Price": p['price_per_day'],
-                            "Date": datetime.now().strftime('%Y-%m-%d %H:%M'),
-                            "Vehicle": p['vehicle']
-                        }
+                        Competitor(
+                            Competitor_Name=p['supplier'],
+                            Competitor_Price=p['price_per_day'],
+                            Date=now_str,
+                            Vehicle=p['vehicle']
+                        )
                         for p in prices
                     ]
-                    
-                    prices_list = [p['price_per_day'] for p in prices]
-                    
-                    branch_data["categories"][category] = {
-                        "avg_price": round(sum(prices_list) / len(prices_list), 2),
-                        "min_price": min(prices_list),
-                        "max_price": max(prices_list),
-                        "competitors": competitors
-                    }
-                    
+
+                    # Single pass over the prices at C speed instead of
+                    # separate sum/min/max/len sweeps of a Python list
+                    arr = np.fromiter(
+                        (p['price_per_day'] for p in prices),
+                        dtype=np.float64, count=len(prices)
+                    )
+
+                    branch_data.categories[category] = CategoryStats(
+                        avg_price=round(float(arr.mean()), 2),
+                        min_price=float(arr.min()),
+                        max_price=float(arr.max()),
+                        competitors=competitors
+                    )
+
+                    populated_cats += 1
                     total_competitors += len(competitors)
                 else:
                     # Empty category
-                    branch_data["categories"][category] = {
-                        "avg_price": None,
-                        "min_price": None,
-                        "max_price": None,
-                        "competitors": []
-                    }
-            
-            results["branches"][branch_name] = branch_data
+                    branch_data.categories[category] = CategoryStats(
+                        avg_price=None, min_price=None,
+                        max_price=None, competitors=[]
+                    )
+
+            results.branches[branch_name] = branch_data
             successful_branches += 1
-            
-            logger.info(f"  Success: {len([c for c in branch_data['categories'].values() if c['competitors']])} categories, {total_competitors} total competitors")
-            
+
+            logger.info(f"  Success: {populated_cats} categories, {total_competitors} total competitors")
+
         except Exception as e:
             logger.error(f"  Failed to scrape {branch_name}: {str(e)}")
             failed_branches.append(branch_name)
-            
+
             # Add empty data for failed branch
-            results["branches"][branch_name] = {
-                "categories": {cat: {"avg_price": None, "min_price": None, "max_price": None, "competitors": []} 
-                              for cat in ["Economy", "Compact", "Standard", "SUV Compact", "SUV Standard", "SUV Large", "Luxury Sedan", "Luxury SUV"]},
-                "last_updated": datetime.now().isoformat(),
-                "location": {"city": branch_info.get("city", ""), "name": branch_info.get("name", "")},
-                "error": str(e)
-            }
+            results.branches[branch_name] = BranchResult(
+                categories={cat: CategoryStats(avg_price=None, min_price=None,
+                                               max_price=None, competitors=[])
+                            for cat in ["Economy", "Compact", "Standard", "SUV Compact", "SUV Standard", "SUV Large", "Luxury Sedan", "Luxury SUV"]},
+                last_updated=now_iso,
+                location=Location(city=branch_info.get("city", ""),
+                                  name=branch_info.get("name", "")),
+                error=str(e)
+            )
     
     # Save results to JSON
     logger.info("\n" + "="*70)
@@ -142,9 +277,63 @@ def scrape_all_branches():
     logger.info("="*70)
     
     try:
-        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-        
+        # Skip the full artifact rewrite when nothing priced differently
+        # since the previous scrape - downstream syncs/caches then see
+        # stable mtimes and only the tiny delta file changes
+        digest = price_digest(results.branches)
+        prev_digest = None
+        if OUTPUT_FILE.exists():
+            try:
+                prev_digest = msgspec.json.decode(
+                    OUTPUT_FILE.read_bytes()).get('__digest')
+            except Exception:
+                pass
+
+        delta_file = OUTPUT_FILE.with_name(OUTPUT_FILE.stem + '_delta.json')
+        delta_file.write_bytes(msgspec.json.encode({
+            "unchanged": prev_digest == digest,
+            "digest": digest,
+            "scrape_timestamp": results.scrape_timestamp
+        }))
+
+        if prev_digest == digest:
+            logger.info(f"Prices unchanged since previous scrape "
+                        f"(digest {digest[:12]}...) - kept existing {OUTPUT_FILE}")
+            return
+        results.digest = digest
+
+        # msgspec encodes the Structs straight to compact UTF-8 bytes;
+        # the dashboard is the only regular reader, and dropping indent
+        # whitespace halves the bytes written and synced
+        payload = msgspec.json.encode(results)
+
+        # Write-then-rename so the dashboard never reads a half-written
+        # file if the scraper crashes mid-write (os.replace is atomic)
+        tmp_file = OUTPUT_FILE.with_name(OUTPUT_FILE.name + '.tmp')
+        tmp_file.write_bytes(payload)
+        os.replace(tmp_file, OUTPUT_FILE)
+
+        # Human-readable copy only when debugging
+        if os.environ.get('DEBUG') == '1':
+            pretty_file = OUTPUT_FILE.with_name(OUTPUT_FILE.stem + '_pretty.json')
+            pretty_file.write_bytes(msgspec.json.format(payload, indent=2))
+            logger.info(f"Pretty copy saved to: {pretty_file}")
+
+        # Gzipped copy for syncing/archiving - ~5x smaller than the
+        # pretty JSON at negligible CPU cost with compresslevel=3
+        gz_file = OUTPUT_FILE.with_name(OUTPUT_FILE.name + '.gz')
+        gz_tmp = gz_file.with_name(gz_file.name + '.tmp')
+        with gzip.open(gz_tmp, 'wb', compresslevel=3) as f:
+            f.write(payload)
+        os.replace(gz_tmp, gz_file)
+
+        # Compact MessagePack sidecar for the dashboard (JSON kept for humans)
+        msgpack_file = OUTPUT_FILE.with_suffix('.msgpack')
+        msgpack_tmp = msgpack_file.with_name(msgpack_file.name + '.tmp')
+        msgpack_tmp.write_bytes(msgspec.msgpack.encode(results))
+        os.replace(msgpack_tmp, msgpack_file)
+        logger.info(f"MessagePack sidecar saved to: {msgpack_file}")
+
         file_size_kb = OUTPUT_FILE.stat().st_size / 1024
         logger.info(f"\nData saved to: {OUTPUT_FILE}")
         logger.info(f"File size: {file_size_kb:.2f} KB")
@@ -160,5 +349,10 @@ def scrape_all_branches():
         raise
 
 if __name__ == "__main__":
-    scrape_all_branches()
+    import argparse
+    parser = argparse.ArgumentParser(description="Daily Kayak competitor price scraper")
+    parser.add_argument('--force', action='store_true',
+                        help="Bypass the on-disk cache and re-fetch all branches")
+    args = parser.parse_args()
+    scrape_all_branches(force=args.force)
 
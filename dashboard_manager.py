@@ -744,8 +744,8 @@ from car_model_matcher import find_matching_vehicles, get_best_matches_per_model
 
 # Get base prices for matching
 base_prices_for_matching = {
-    cat: pricing_results[cat]['base_price'] 
-    for cat in pricing_results.keys()
+    cat: result['base_price']
+    for cat, result in pricing_results.items()
 }
 
 # Get competitor data in the right format
@@ -192,9 +192,9 @@ def discover_key_tables(db_dict: pd.DataFrame) -> Dict[str, List[str]]:
     # Get unique schema.table combinations
     tables = db_dict.groupby(['SchemaName', 'TableName']).size().reset_index()[['SchemaName', 'TableName']]
     
-    for _, row in tables.iterrows():
-        schema = row['SchemaName']
-        table = row['TableName']
+    for row in tables.itertuples(index=False):
+        schema = row.SchemaName
+        table = row.TableName
         full_name = f"{schema}.{table}"
         
         # Categorize tables
@@ -259,6 +259,38 @@ def validate_table_exists(db_dict: pd.DataFrame, schema: str, table: str) -> boo
     return exists
 
 
+def get_live_table_schema(db_conn: DatabaseConnection,
+                          tables: List[tuple]) -> pd.DataFrame:
+    """
+    Fetch column metadata for several tables in one round trip.
+
+    Queries INFORMATION_SCHEMA.COLUMNS instead of selecting sample rows,
+    so no actual data rows are materialized or transferred just to
+    inspect a table's shape.
+
+    Args:
+        db_conn: Database connection object
+        tables: List of (schema, table) tuples
+
+    Returns:
+        pd.DataFrame: One row per column with schema, table, name and type
+    """
+    conditions = ' OR '.join(
+        '(TABLE_SCHEMA = ? AND TABLE_NAME = ?)' for _ in tables
+    )
+    params = tuple(part for pair in tables for part in pair)
+    query = (
+        "SELECT TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_TYPE "
+        "FROM INFORMATION_SCHEMA.COLUMNS "
+        f"WHERE {conditions} "
+        "ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION"
+    )
+    result = db_conn.execute_query(query, params)
+    logger.info(f"Fetched live schema for {len(tables)} tables "
+                f"({len(result)} columns) in one query")
+    return result
+
+
 def get_table_row_count(db_conn: DatabaseConnection, schema: str, table: str) -> int:
     """
     Get row count for a specific table.
@@ -8,8 +8,6 @@ Usage:
     python export_data_for_production.py
 """
 
-import pandas as pd
-import pyodbc
 from datetime import datetime, timedelta
 from pathlib import Path
 import config
@@ -20,10 +18,17 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 
 def export_vehicle_history():
     """Export current utilization per branch to local CSV."""
+    # Deferred: pyodbc and pyarrow cost noticeable import time/RSS, and
+    # importing this module (e.g. from tooling) should not pay for them
+    import pyodbc
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import csv as pa_csv
+
     print("="*60)
     print("EXPORTING VEHICLE HISTORY FOR PRODUCTION")
     print("="*60)
-    
+
     try:
         # Connect to database
         conn_str = (
@@ -34,11 +39,11 @@ def export_vehicle_history():
         )
         conn = pyodbc.connect(conn_str)
         print("[OK] Connected to database")
-        
+
         # Query: Get latest status per vehicle per branch
         query = """
         WITH LatestStatus AS (
-            SELECT 
+            SELECT
                 vh.VehicleId,
                 vh.BranchId,
                 vh.StatusId,
@@ -47,7 +52,7 @@ def export_vehicle_history():
             FROM Fleet.VehicleHistory vh
             WHERE vh.OperationDateTime >= DATEADD(day, -60, GETDATE())
         )
-        SELECT 
+        SELECT
             BranchId,
             COUNT(*) as total_vehicles,
             SUM(CASE WHEN StatusId IN (141, 144, 146, 147, 154, 155) THEN 1 ELSE 0 END) as rented_vehicles,
@@ -57,33 +62,53 @@ def export_vehicle_history():
         GROUP BY BranchId
         ORDER BY BranchId
         """
-        
-        df = pd.read_sql(query, conn)
+
+        cursor = conn.cursor()
+        rows = cursor.execute(query).fetchall()
         conn.close()
-        
-        # Calculate utilization percentage
-        df['utilization_pct'] = (df['rented_vehicles'] / df['total_vehicles'] * 100).round(1)
-        
+
+        # Build an Arrow table directly from the cursor rows - no pandas
+        # round trip just to add two derived columns
+        total = pa.array([r[1] for r in rows], type=pa.int64())
+        rented = pa.array([r[2] for r in rows], type=pa.int64())
+        table = pa.table({
+            'BranchId': pa.array([r[0] for r in rows], type=pa.int64()),
+            'total_vehicles': total,
+            'rented_vehicles': rented,
+            'available_vehicles': pa.array([r[3] for r in rows], type=pa.int64()),
+        })
+
+        # Calculate utilization percentage (vectorized in Arrow)
+        utilization = pc.round(
+            pc.multiply(pc.divide(pc.cast(rented, pa.float64()),
+                                  pc.cast(total, pa.float64())), 100),
+            ndigits=1
+        )
+        table = table.append_column('utilization_pct', utilization)
+
         # Add export timestamp
-        df['export_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
+        export_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        table = table.append_column(
+            'export_date', pa.array([export_date] * len(rows))
+        )
+
         # Save to CSV
         output_file = OUTPUT_DIR / 'vehicle_history_local.csv'
-        df.to_csv(output_file, index=False)
-        
-        print(f"[OK] Exported {len(df)} branches to {output_file}")
+        pa_csv.write_csv(table, output_file)
+
+        print(f"[OK] Exported {table.num_rows} branches to {output_file}")
         print("\nData preview:")
-        print(df.to_string())
-        
+        print(table.slice(0, 10))
+
         print("\n" + "="*60)
         print("EXPORT COMPLETE!")
         print("="*60)
         print(f"\nFile saved: {output_file}")
         print("\nYou can now deploy without database connection.")
         print("The dashboard will use this local file for utilization data.")
-        
-        return df
-        
+
+        return table
+
     except Exception as e:
         print(f"[ERROR] {e}")
         return None
@@ -91,4 +116,3 @@ def export_vehicle_history():
 
 if __name__ == "__main__":
     export_vehicle_history()
-
@@ -44,9 +44,17 @@ GROUP BY BranchId
 ORDER BY BranchId
 """
 
-df = pd.read_sql(query, conn, params=[TARGET_DATE, TARGET_DATE])
+# Fetch via the raw cursor and build the frame in one shot rather than
+# going through pd.read_sql's per-cell conversion path
+cursor = conn.cursor()
+rows = cursor.execute(query, [TARGET_DATE, TARGET_DATE]).fetchall()
 conn.close()
 
+df = pd.DataFrame.from_records(
+    [tuple(r) for r in rows],
+    columns=['BranchId', 'total_vehicles', 'rented_vehicles', 'available_vehicles']
+)
+
 # Calculate utilization percentage
 df['utilization_pct'] = (df['rented_vehicles'] / df['total_vehicles'] * 100).round(1)
 df['export_date'] = f"{TARGET_DATE.strftime('%Y-%m-%d')} (historical)"
@@ -70,13 +78,15 @@ dashboard_branches = {
 
 print(f"\nDASHBOARD BRANCHES (as of {TARGET_DATE.strftime('%Y-%m-%d')}):")
 print("-"*70)
-for branch_id, name in dashboard_branches.items():
-    row = df[df['BranchId'] == branch_id]
-    if len(row) > 0:
-        r = row.iloc[0]
+# One reindex against the branch ids instead of a full-column boolean
+# scan per dashboard branch
+branch_rows = df.set_index('BranchId').reindex(dashboard_branches.keys())
+for (branch_id, name), r in zip(dashboard_branches.items(),
+                                branch_rows.itertuples(index=False)):
+    if pd.notna(r.total_vehicles):
         print(f"{name} (ID: {branch_id})")
-        print(f"  Total: {r['total_vehicles']} | Rented: {r['rented_vehicles']} | Available: {r['available_vehicles']}")
-        print(f"  Utilization: {r['utilization_pct']}%")
+        print(f"  Total: {r.total_vehicles:.0f} | Rented: {r.rented_vehicles:.0f} | Available: {r.available_vehicles:.0f}")
+        print(f"  Utilization: {r.utilization_pct}%")
     else:
         print(f"{name} (ID: {branch_id}): NO DATA")
 
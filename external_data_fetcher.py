@@ -16,6 +16,7 @@ import logging
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Dict
 import requests
 from pathlib import Path
@@ -252,18 +253,27 @@ def get_umrah_peak_periods() -> pd.DataFrame:
     return df
 
 
-def create_holiday_features(start_date: str = '2023-01-01', 
+def create_holiday_features(start_date: str = '2023-01-01',
                            end_date: str = '2025-12-31') -> pd.DataFrame:
     """
     Create a comprehensive calendar with holiday and event features.
-    
+
+    The calendar depends only on the date range, so repeated calls with
+    the same range reuse one build via an in-process cache.
+
     Args:
         start_date: Start date for calendar
         end_date: End date for calendar
-        
+
     Returns:
         pd.DataFrame: Daily calendar with external features
     """
+    # Copy so callers can mutate their frame without corrupting the cache
+    return _build_holiday_features(start_date, end_date).copy()
+
+
+@lru_cache(maxsize=4)
+def _build_holiday_features(start_date: str, end_date: str) -> pd.DataFrame:
     logger.info(f"Creating external features calendar from {start_date} to {end_date}...")
     
     # Create date range
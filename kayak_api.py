@@ -2,16 +2,50 @@
 Kayak Search API Integration for Car Rentals
 Fetches real competitor pricing from Kayak aggregator
 """
+import re
 import requests
+import requests.adapters
 import logging
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Optional
 from datetime import datetime, date, timedelta
 from car_model_category_mapping import get_correct_category
 import config
 
+# orjson parses the large car-search payloads several times faster than
+# the stdlib parser behind response.json()
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Short-TTL response cache: identical (location, dates) queries within an
+# hour skip the network round trip entirely
+try:
+    import diskcache
+    HAS_DISKCACHE = True
+except ImportError:
+    HAS_DISKCACHE = False
+
+CACHE_TTL_SECONDS = 3600
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=8192)
+def _cached_correct_category(vehicle_name: str, kayak_category: str) -> str:
+    """
+    get_correct_category memoized at module scope: the same fleet models
+    repeat across suppliers, branches and days, so after warmup nearly
+    every lookup skips the model-database scan.
+    """
+    return get_correct_category(vehicle_name, kayak_category)
+
+
 class KayakAPI:
     """
     Kayak Search API client for car rental pricing
@@ -24,7 +58,25 @@ class KayakAPI:
             "x-rapidapi-host": self.host,
             "x-rapidapi-key": self.api_key
         }
-        
+
+        # Persistent session: one TCP+TLS handshake reused across all
+        # branch calls, with a pool large enough for the concurrent scrape
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # Retry throttles/transient server errors with exponential backoff
+        # (2s, 4s, 8s...) instead of failing the branch outright; 429
+        # Retry-After headers are honoured by urllib3
+        retry = requests.adapters.Retry(
+            total=4,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"]
+        )
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=16, pool_maxsize=64, max_retries=retry
+        )
+        self.session.mount("https://", adapter)
+
         # Kayak location IDs for Renty branches
         self.location_mapping = {
             "King Khalid Airport - Riyadh": "RUH::airport",
@@ -48,7 +100,30 @@ class KayakAPI:
             "Luxury Sedan": ["Luxury", "Premium"],
             "Luxury SUV": ["Luxury SUV"]
         }
-    
+
+        # Flipped mapping for O(1) Kayak->Renty lookups (first Renty
+        # category wins for any duplicate Kayak name, matching the old
+        # linear scan), plus compiled keyword unions so each fallback is
+        # one regex pass over the vehicle name instead of a substring
+        # check per keyword
+        self._kayak_to_renty = {}
+        for renty_cat, kayak_cats in self.category_mapping.items():
+            for kayak_cat in kayak_cats:
+                self._kayak_to_renty.setdefault(kayak_cat, renty_cat)
+
+        self._suv_rx = re.compile(
+            r'SUV|X-TRAIL|RAV4|TUCSON|SPORTAGE|CRETA|KONA|QASHQAI')
+        self._large_suv_rx = re.compile(
+            r'LAND CRUISER|HIGHLANDER|PATROL|TAHOE|YUKON|SUBURBAN')
+        self._luxury_rx = re.compile(r'BMW|MERCEDES|AUDI|LEXUS')
+
+        # Already-processed category prices keyed by (location, dates);
+        # cross-process so repeated dashboard refreshes share hits
+        self._response_cache = (
+            diskcache.Cache('data/.kayak_cache') if HAS_DISKCACHE else None
+        )
+
+
     def _get_kayak_location_id(self, branch_name: str) -> Optional[str]:
         """Get Kayak location ID for a Renty branch"""
         return self.location_mapping.get(branch_name)
@@ -60,15 +135,15 @@ class KayakAPI:
         2. Kayak category name
         """
         # Try car model mapping first (most accurate)
-        renty_cat = get_correct_category(vehicle_name, kayak_category)
+        renty_cat = _cached_correct_category(vehicle_name, kayak_category)
         if renty_cat != "Unknown":
             return renty_cat
-        
+
         # Fall back to Kayak category mapping
-        for renty_category, kayak_categories in self.category_mapping.items():
-            if kayak_category in kayak_categories:
-                return renty_category
-        
+        mapped = self._kayak_to_renty.get(kayak_category)
+        if mapped is not None:
+            return mapped
+
         # Default fallback
         if 'suv' in kayak_category.lower():
             return "SUV Standard"
@@ -83,33 +158,34 @@ class KayakAPI:
         The car_model_category_mapping.py has the most accurate mappings.
         """
         # Use the car model database - it's the most accurate
-        renty_cat = get_correct_category(vehicle_name, kayak_category)
+        renty_cat = _cached_correct_category(vehicle_name, kayak_category)
         
         if renty_cat != "Unknown":
             return renty_cat
         
         # If not in database, use category mapping
-        for renty_category, kayak_categories in self.category_mapping.items():
-            if kayak_category in kayak_categories:
-                return renty_category
-        
+        mapped = self._kayak_to_renty.get(kayak_category)
+        if mapped is not None:
+            return mapped
+
         # Smart fallback based on keywords
         vehicle_upper = vehicle_name.upper()
-        
+
         # Check for SUVs
-        if any(x in vehicle_upper for x in ['SUV', 'X-TRAIL', 'RAV4', 'TUCSON', 'SPORTAGE', 'CRETA', 'KONA', 'QASHQAI']):
+        if self._suv_rx.search(vehicle_upper):
+            kayak_lower = kayak_category.lower()
             # Small/Compact SUVs
-            if any(x in kayak_category.lower() for x in ['compact', 'small']):
+            if 'compact' in kayak_lower or 'small' in kayak_lower:
                 return "SUV Compact"
             # Large SUVs
-            elif any(x in vehicle_upper for x in ['LAND CRUISER', 'HIGHLANDER', 'PATROL', 'TAHOE', 'YUKON', 'SUBURBAN']):
+            elif self._large_suv_rx.search(vehicle_upper):
                 return "SUV Large"
             # Standard SUVs
             else:
                 return "SUV Standard"
-        
+
         # Check for luxury brands (sedans)
-        if any(x in vehicle_upper for x in ['BMW', 'MERCEDES', 'AUDI', 'LEXUS']) and 'SUV' not in vehicle_upper:
+        if self._luxury_rx.search(vehicle_upper) and 'SUV' not in vehicle_upper:
             return "Luxury Sedan"
         
         # Check for pickup trucks
@@ -135,7 +211,14 @@ class KayakAPI:
         if not location_id:
             logger.warning(f"No Kayak location mapping for branch: {branch_name}")
             return {}
-        
+
+        cache_key = f"{location_id}:{pickup_date.isoformat()}:{dropoff_date.isoformat()}"
+        if self._response_cache is not None:
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Kayak cache hit for {branch_name} ({location_id})")
+                return cached
+
         url = f"https://{self.host}/cars/search"
         
         params = {
@@ -153,16 +236,23 @@ class KayakAPI:
         
         try:
             logger.info(f"Searching Kayak for {branch_name} ({location_id})")
-            response = requests.get(url, headers=self.headers, params=params, timeout=60)
+            response = self.session.get(url, params=params, timeout=60)
             
             if response.status_code == 200:
-                data = response.json()
+                if HAS_ORJSON:
+                    data = orjson.loads(response.content)
+                else:
+                    data = response.json()
                 results = data.get('data', {}).get('results', [])
                 
                 logger.info(f"Found {len(results)} cars from Kayak for {branch_name}")
                 
-                # Process results into categories
+                # Process results into categories. The processed form is
+                # what gets cached - cheaper than re-parsing raw JSON
                 category_prices = self._process_kayak_results(results, pickup_date, dropoff_date)
+                if self._response_cache is not None and category_prices:
+                    self._response_cache.set(cache_key, category_prices,
+                                             expire=CACHE_TTL_SECONDS)
                 return category_prices
             else:
                 logger.error(f"Kayak API error: {response.status_code} - {response.text[:200]}")
@@ -172,6 +262,25 @@ class KayakAPI:
             logger.error(f"Error fetching from Kayak: {str(e)}")
             return {}
     
+    def search_cars_multi(self, branch_names: List[str], pickup_date: date,
+                          dropoff_date: date) -> Dict[str, Dict[str, List[Dict]]]:
+        """
+        Search several branches concurrently.
+
+        Each branch is one independent API round trip, so running them on
+        a thread pool over the shared session drops wall time from the
+        sum of the latencies to the slowest branch.
+
+        Returns:
+            Dict mapping branch name to that branch's category prices
+        """
+        with ThreadPoolExecutor(max_workers=min(8, len(branch_names))) as executor:
+            results = executor.map(
+                lambda branch: self.search_cars(branch, pickup_date, dropoff_date),
+                branch_names
+            )
+        return dict(zip(branch_names, results))
+
     def _process_kayak_results(self, results: List[Dict], pickup_date: date, dropoff_date: date) -> Dict[str, List[Dict]]:
         """
         Process Kayak results into Renty categories
@@ -193,65 +302,76 @@ class KayakAPI:
         rental_days = (dropoff_date - pickup_date).days
         if rental_days == 0:
             rental_days = 1
-        
+
+        # Single extraction pass; the numeric cleanup, currency
+        # conversion and per-supplier dedup below all run as vectorized
+        # pandas ops instead of per-car Python branching
+        records = []
         for car in results:
             try:
-                # Get supplier/agency
-                agency_code = car.get('agencyCode', 'Unknown')
-                
-                # Get vehicle details from first provider
                 providers = car.get('providers', [])
                 if not providers:
                     continue
-                
                 provider = providers[0]
                 vehicle_detail = provider.get('vehicleDetail', {})
-                
-                vehicle_name = vehicle_detail.get('brand', 'Unknown').strip()
-                kayak_category = vehicle_detail.get('localizedCarClassName', 'Unknown').strip()
-                
-                # Get price
                 day_price = provider.get('dayPrice', 0)
-                currency = provider.get('currencyCode', 'SAR')
-                
-                # Convert USD to SAR if needed
-                if currency == 'USD':
-                    day_price = day_price * 3.75  # USD to SAR conversion
-                
-                # Skip if price is 0 or unreasonably high
-                if day_price <= 0 or day_price > 5000:
-                    continue
-                
-                # Map to Renty category (price-aware)
-                renty_category = self._map_to_renty_category_price_aware(
-                    vehicle_name, kayak_category, day_price
-                )
-                
-                if renty_category in category_prices:
-                    category_prices[renty_category].append({
-                        'supplier': agency_code.title(),
-                        'vehicle': vehicle_name,
-                        'price_per_day': round(day_price, 2),
-                        'category_original': kayak_category
-                    })
-            
+                # Strings/None never made it past the baseline's float
+                # math; keep rejecting them here so the warning below
+                # still fires instead of a silent coercion
+                if not isinstance(day_price, (int, float)):
+                    raise TypeError(f"non-numeric dayPrice: {day_price!r}")
+                records.append((
+                    car.get('agencyCode', 'Unknown'),
+                    vehicle_detail.get('brand', 'Unknown').strip(),
+                    vehicle_detail.get('localizedCarClassName', 'Unknown').strip(),
+                    day_price,
+                    provider.get('currencyCode', 'SAR')
+                ))
             except Exception as e:
                 logger.warning(f"Error processing Kayak car result: {str(e)}")
                 continue
-        
-        # Deduplicate: Keep lowest price per supplier per category
-        for category in category_prices.keys():
-            prices = category_prices[category]
-            if prices:
-                # Keep lowest price per supplier
-                supplier_best = {}
-                for price in prices:
-                    supplier = price['supplier']
-                    if supplier not in supplier_best or price['price_per_day'] < supplier_best[supplier]['price_per_day']:
-                        supplier_best[supplier] = price
-                
-                category_prices[category] = list(supplier_best.values())
-        
+
+        if not records:
+            return category_prices
+
+        df = pd.DataFrame(records, columns=['agency', 'vehicle', 'kayak_category',
+                                            'day_price', 'currency'])
+
+        # Convert USD to SAR, drop zero/unreasonable prices (records are
+        # already numeric - bad payload values were skipped above)
+        df['day_price'] = df['day_price'].astype(float)
+        df.loc[df['currency'] == 'USD', 'day_price'] *= 3.75
+        df = df[(df['day_price'] > 0) & (df['day_price'] <= 5000)]
+        if df.empty:
+            return category_prices
+
+        # Map each distinct (vehicle, class) pair to a Renty category
+        # once - the payload repeats the same pairs across agencies
+        pairs = df.groupby(['vehicle', 'kayak_category'],
+                           sort=False)['day_price'].first().reset_index()
+        pair_map = {
+            (r.vehicle, r.kayak_category): self._map_to_renty_category_price_aware(
+                r.vehicle, r.kayak_category, r.day_price)
+            for r in pairs.itertuples(index=False)
+        }
+        df['renty_cat'] = [
+            pair_map[(v, k)] for v, k in zip(df['vehicle'], df['kayak_category'])
+        ]
+        df = df[df['renty_cat'].isin(category_prices)]
+
+        # Keep lowest price per supplier per category: stable sort by
+        # price then first row per (category, supplier)
+        best = df.sort_values('day_price',
+                              kind='stable').drop_duplicates(['renty_cat', 'agency'])
+
+        for row in best.itertuples(index=False):
+            category_prices[row.renty_cat].append({
+                'supplier': row.agency.title(),
+                'vehicle': row.vehicle,
+                'price_per_day': round(row.day_price, 2),
+                'category_original': row.kayak_category
+            })
+
         return category_prices
     
     def get_competitor_prices_for_dashboard(self, branch_name: str, date: date, **kwargs) -> Dict:
@@ -9,6 +9,19 @@ import json
 import os
 from typing import Dict, List
 
+# Renty -> competitor category naming. Module-level constant so the hot
+# per-competitor lookup does not rebuild (and re-hash) the dict per call
+COMPETITOR_CATEGORY_NAMES = {
+    'Economy': 'Economy',
+    'Compact': 'Compact',
+    'Standard': 'Standard/Midsize',
+    'SUV Compact': 'Compact SUV',
+    'SUV Standard': 'Standard SUV',
+    'SUV Large': 'Full-size SUV',
+    'Luxury Sedan': 'Luxury Sedan',
+    'Luxury SUV': 'Luxury SUV'
+}
+
 
 class LiveCompetitorPricing:
     """
@@ -218,17 +231,7 @@ class LiveCompetitorPricing:
     
     def _map_category_to_competitor(self, renty_cat: str, competitor: str) -> str:
         """Map Renty category to competitor naming"""
-        mapping = {
-            'Economy': 'Economy',
-            'Compact': 'Compact',
-            'Standard': 'Standard/Midsize',
-            'SUV Compact': 'Compact SUV',
-            'SUV Standard': 'Standard SUV',
-            'SUV Large': 'Full-size SUV',
-            'Luxury Sedan': 'Luxury Sedan',
-            'Luxury SUV': 'Luxury SUV'
-        }
-        return mapping.get(renty_cat, renty_cat)
+        return COMPETITOR_CATEGORY_NAMES.get(renty_cat, renty_cat)
     
     def _get_cache(self, key: str, ttl_seconds: int = 300) -> Dict:
         """Get cached data"""
@@ -258,8 +261,11 @@ class LiveCompetitorPricing:
                 'cached_at': datetime.now().isoformat(),
                 'data': data
             }
-            with open(cache_file, 'w') as f:
-                json.dump(cache_entry, f, indent=2)
+            # Serialize to bytes once and write in a single call instead
+            # of json.dump streaming indented chunks through a text wrapper
+            payload = json.dumps(cache_entry, separators=(',', ':')).encode('utf-8')
+            with open(cache_file, 'wb') as f:
+                f.write(payload)
         except Exception as e:
             print(f"Cache error: {e}")
 
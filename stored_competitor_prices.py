@@ -8,46 +8,102 @@ from datetime import datetime
 from typing import Dict, Optional
 from pathlib import Path
 
+# The daily scraper writes a MessagePack sidecar next to the JSON; when
+# msgspec is installed the dashboard parses that instead (smaller and much
+# faster to decode than the pretty JSON)
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
+
+# orjson decodes the plain-JSON fallback several times faster than the
+# stdlib parser
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Path to stored data file - use absolute path relative to this script's location
 SCRIPT_DIR = Path(__file__).resolve().parent
 DATA_FILE = SCRIPT_DIR / "data" / "competitor_prices" / "daily_competitor_prices.json"
+MSGPACK_FILE = DATA_FILE.with_suffix('.msgpack')
 
 # Cache the loaded data in memory
 _cached_data = None
 _cache_timestamp = None
+_cache_mtime = None
+# Lowercased branch name -> stored branch name, built once per load so
+# per-call matching is a dict probe instead of a scan over all branches
+_branch_index = {}
+# (stored branch name, category) -> prebuilt result dict, so the hot
+# dashboard lookup skips the per-call min/max reductions
+_category_lookup = {}
 
 def clear_cache():
     """Clear the in-memory cache to force fresh data load"""
-    global _cached_data, _cache_timestamp
+    global _cached_data, _cache_timestamp, _cache_mtime, _branch_index, _category_lookup
     _cached_data = None
     _cache_timestamp = None
+    _cache_mtime = None
+    _branch_index = {}
+    _category_lookup = {}
     logger.info("Competitor price cache cleared")
 
 def load_stored_data(force_reload=False) -> Optional[Dict]:
     """
     Load competitor price data from stored JSON file
-    Uses in-memory cache to avoid repeated file reads
-    
+    Uses in-memory cache to avoid repeated file reads, reloading
+    automatically when the scraper has written a newer file
+
     Set force_reload=True to bypass cache and load fresh from file
     """
-    global _cached_data, _cache_timestamp
-    
-    # Return cached data if available and not forcing reload
+    global _cached_data, _cache_timestamp, _cache_mtime, _branch_index, _category_lookup
+
+    # Return cached data if available, not forcing reload, and the file
+    # has not been rewritten since it was cached
     if _cached_data is not None and not force_reload:
-        return _cached_data
-    
+        try:
+            if DATA_FILE.stat().st_mtime == _cache_mtime:
+                return _cached_data
+        except OSError:
+            return _cached_data
+
     try:
         if not DATA_FILE.exists():
             logger.error(f"Competitor price file not found: {DATA_FILE}")
             return None
-            
-        with open(DATA_FILE, 'r', encoding='utf-8') as f:
-            _cached_data = json.load(f)
-            _cache_timestamp = datetime.now()
-        
+
+        # Prefer the MessagePack sidecar when it is at least as fresh as
+        # the JSON (the scraper writes both in the same run)
+        if (HAS_MSGSPEC and MSGPACK_FILE.exists()
+                and MSGPACK_FILE.stat().st_mtime >= DATA_FILE.stat().st_mtime):
+            _cached_data = msgspec.msgpack.decode(MSGPACK_FILE.read_bytes())
+        elif HAS_ORJSON:
+            _cached_data = orjson.loads(DATA_FILE.read_bytes())
+        else:
+            with open(DATA_FILE, 'r', encoding='utf-8') as f:
+                _cached_data = json.load(f)
+        _cache_timestamp = datetime.now()
+        _cache_mtime = DATA_FILE.stat().st_mtime
+        _branch_index = {b.lower(): b for b in _cached_data.get('branches', {})}
+        _category_lookup = {}
+        for branch, branch_data in _cached_data.get('branches', {}).items():
+            for category, category_data in branch_data.get('categories', {}).items():
+                competitors = category_data.get('competitors', [])
+                prices = [c['Competitor_Price'] for c in competitors]
+                _category_lookup[(branch, category)] = {
+                    'avg_price': category_data.get('avg_price'),
+                    'min_price': min(prices) if prices else None,
+                    'max_price': max(prices) if prices else None,
+                    'competitors': competitors,
+                    'competitor_count': len(competitors)
+                }
+
         logger.info(f"Loaded competitor prices from: {DATA_FILE}")
         logger.info(f"Data scraped at: {_cached_data.get('scrape_timestamp', 'Unknown')}")
         
@@ -88,18 +144,19 @@ def get_competitor_prices_for_branch_category(branch_name: str, category: str) -
             'competitor_count': 0
         }
     
-    # Try exact match first
-    branch_data = data.get('branches', {}).get(branch_name)
-    
+    # Try exact (case-insensitive) match via the prebuilt index
+    branch_lower = branch_name.lower()
+    stored_branch = _branch_index.get(branch_lower)
+
     # If not found, try fuzzy match
-    if not branch_data:
-        for stored_branch, stored_data in data.get('branches', {}).items():
-            if branch_name.lower() in stored_branch.lower() or stored_branch.lower() in branch_name.lower():
-                branch_data = stored_data
-                logger.info(f"Fuzzy matched '{branch_name}' to '{stored_branch}'")
+    if stored_branch is None:
+        for candidate_lower, candidate in _branch_index.items():
+            if branch_lower in candidate_lower or candidate_lower in branch_lower:
+                stored_branch = candidate
+                logger.info(f"Fuzzy matched '{branch_name}' to '{candidate}'")
                 break
-    
-    if not branch_data:
+
+    if stored_branch is None:
         logger.warning(f"Branch '{branch_name}' not found in stored data")
         return {
             'avg_price': None,
@@ -108,12 +165,13 @@ def get_competitor_prices_for_branch_category(branch_name: str, category: str) -
             'competitors': [],
             'competitor_count': 0
         }
-    
-    # Get category data
-    categories = branch_data.get('categories', {})
-    category_data = categories.get(category)
-    
-    if not category_data:
+
+    # Stats were precomputed at load time; a hit is one dict probe with
+    # no per-call min/max reductions. Copied so callers can mutate
+    # their result without touching the cache
+    result = _category_lookup.get((stored_branch, category))
+
+    if result is None:
         logger.warning(f"Category '{category}' not found for branch '{branch_name}'")
         return {
             'avg_price': None,
@@ -122,18 +180,8 @@ def get_competitor_prices_for_branch_category(branch_name: str, category: str) -
             'competitors': [],
             'competitor_count': 0
         }
-    
-    # Extract and return data
-    competitors = category_data.get('competitors', [])
-    competitor_prices = [c['Competitor_Price'] for c in competitors] if competitors else []
-    
-    return {
-        'avg_price': category_data.get('avg_price'),
-        'min_price': min(competitor_prices) if competitor_prices else None,
-        'max_price': max(competitor_prices) if competitor_prices else None,
-        'competitors': competitors,
-        'competitor_count': len(competitors)
-    }
+
+    return dict(result)
 
 def get_data_freshness() -> Dict:
     """
@@ -156,16 +156,22 @@ def get_current_utilization(branch_id: int = None, date = None) -> dict:
         WHERE rn = 1
         """
         
-        # CRITICAL: Filter by branch AFTER getting latest status
+        # CRITICAL: Filter by branch AFTER getting latest status.
+        # Parameterized like the other predicates so SQL Server can reuse
+        # one cached plan across branches instead of compiling per literal
         if branch_id:
-            query += f" AND BranchId = {branch_id}"
+            query += " AND BranchId = ?"
+            params.append(branch_id)
         
         query += " GROUP BY BranchId"
         
-        df = pd.read_sql(query, conn, params=params)
+        # Raw cursor fetch - no DataFrame round trip just to read one row
+        # of scalars out of a tiny aggregate result
+        cursor = conn.cursor()
+        rows = cursor.execute(query, params).fetchall()
         conn.close()
-        
-        if len(df) == 0:
+
+        if not rows:
             logger.warning(f"No utilization data for branch {branch_id}")
             return {
                 'total_vehicles': 100,
@@ -174,12 +180,12 @@ def get_current_utilization(branch_id: int = None, date = None) -> dict:
                 'utilization_pct': 50.0,
                 'source': 'default'
             }
-        
+
         # Get first row (should be only one if branch_id specified)
-        row = df.iloc[0]
-        total = int(row['total_vehicles'])
-        rented = int(row['rented_vehicles'])
-        available = int(row['available_vehicles'])
+        row = rows[0]
+        total = int(row.total_vehicles)
+        rented = int(row.rented_vehicles)
+        available = int(row.available_vehicles)
         
         utilization_pct = (rented / total * 100) if total > 0 else 0
         
@@ -254,9 +260,17 @@ def get_all_branches_utilization(date: datetime = None) -> pd.DataFrame:
         ORDER BY BranchId
         """
         
-        df = pd.read_sql(query, conn, params=[date - timedelta(days=60), date])
+        # Fetch via the raw cursor and build the frame in one shot rather
+        # than going through pd.read_sql's per-cell conversion path
+        cursor = conn.cursor()
+        rows = cursor.execute(query, [date - timedelta(days=60), date]).fetchall()
         conn.close()
-        
+
+        df = pd.DataFrame.from_records(
+            [tuple(r) for r in rows],
+            columns=['BranchId', 'total_vehicles', 'rented_vehicles', 'available_vehicles']
+        )
+
         df['utilization_pct'] = (df['rented_vehicles'] / df['total_vehicles'] * 100).round(1)
         
         logger.info(f"✓ Retrieved utilization for {len(df)} branches")
@@ -289,9 +303,9 @@ if __name__ == "__main__":
         logger.info(f"   Retrieved {len(df)} branches")
         logger.info("\n   Top 5 branches by utilization:")
         top5 = df.nlargest(5, 'utilization_pct')
-        for _, row in top5.iterrows():
-            logger.info(f"     Branch {row['BranchId']}: {row['utilization_pct']}% "
-                       f"({row['rented_vehicles']}/{row['total_vehicles']})")
+        for row in top5.itertuples(index=False):
+            logger.info(f"     Branch {row.BranchId}: {row.utilization_pct}% "
+                       f"({row.rented_vehicles}/{row.total_vehicles})")
     
     logger.info("\n" + "="*80)
     logger.info("TEST COMPLETE")
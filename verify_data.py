@@ -12,50 +12,68 @@ conn_str = (
 )
 conn = pyodbc.connect(conn_str)
 
-# Check branch 122 (King Khalid Airport) from LIVE database
+# Latest status per vehicle for ALL branches in one grouped query,
+# instead of one round-trip per branch
 query = """
 WITH LatestStatus AS (
     SELECT VehicleId, BranchId, StatusId,
            ROW_NUMBER() OVER (PARTITION BY VehicleId ORDER BY OperationDateTime DESC) as rn
     FROM Fleet.VehicleHistory
     WHERE OperationDateTime >= DATEADD(day, -60, GETDATE())
-      AND BranchId = 122
 )
-SELECT COUNT(*) as total,
+SELECT BranchId,
+       COUNT(*) as total,
        SUM(CASE WHEN StatusId IN (141, 144, 146, 147, 154, 155) THEN 1 ELSE 0 END) as rented,
        SUM(CASE WHEN StatusId = 140 THEN 1 ELSE 0 END) as available
 FROM LatestStatus WHERE rn = 1
+GROUP BY BranchId
 """
 cursor = conn.cursor()
-cursor.execute(query)
-row = cursor.fetchone()
+rows = cursor.execute(query).fetchall()
+conn.close()
+
+live_df = pd.DataFrame.from_records(
+    [tuple(r) for r in rows],
+    columns=['BranchId', 'total', 'rented', 'available']
+)
 
 print("=" * 60)
 print("LIVE DATABASE VERIFICATION")
 print("=" * 60)
-print(f"\nBranch 122 (King Khalid Airport) - LIVE from Fleet.VehicleHistory:")
-print(f"  Total vehicles: {row[0]}")
-print(f"  Rented: {row[1]}")
-print(f"  Available: {row[2]}")
-print(f"  Utilization: {round(row[1]/row[0]*100, 1)}%")
+print(f"\nLIVE from Fleet.VehicleHistory: {len(live_df)} branches")
 
-# Compare with exported CSV
+# Compare with exported CSV in one join + vectorized equality instead
+# of slicing the frame per branch
 print("\n" + "-" * 60)
 df = pd.read_csv('data/vehicle_history_local.csv')
-branch_122 = df[df['BranchId'] == 122].iloc[0]
-print(f"\nBranch 122 from EXPORTED CSV:")
-print(f"  Total vehicles: {branch_122['total_vehicles']}")
-print(f"  Rented: {branch_122['rented_vehicles']}")
-print(f"  Available: {branch_122['available_vehicles']}")
-print(f"  Utilization: {branch_122['utilization_pct']}%")
-print(f"  Export time: {branch_122['export_date']}")
+merged = live_df.merge(df, on='BranchId', how='inner', suffixes=('_live', '_csv'))
+merged['match'] = merged['total'] == merged['total_vehicles']
+
+print(f"\nEXPORTED CSV: {len(df)} branches ({merged['match'].sum()} match live totals)")
+
+# Spotlight branch 122 (King Khalid Airport) as the reference check
+spotlight = merged[merged['BranchId'] == 122]
+if len(spotlight) > 0:
+    b = spotlight.iloc[0]
+    print(f"\nBranch 122 (King Khalid Airport):")
+    print(f"  Total vehicles: live={b['total']}, csv={b['total_vehicles']}")
+    print(f"  Rented:         live={b['rented']}, csv={b['rented_vehicles']}")
+    print(f"  Available:      live={b['available']}, csv={b['available_vehicles']}")
+    print(f"  Utilization:    live={round(b['rented'] / b['total'] * 100, 1)}%, "
+          f"csv={b['utilization_pct']}%")
+    print(f"  Export time: {b['export_date']}")
+
+mismatches = merged[~merged['match']]
+if len(mismatches) > 0:
+    lines = ('  Branch ' + mismatches['BranchId'].astype(str)
+             + ': live=' + mismatches['total'].astype(str)
+             + ', csv=' + mismatches['total_vehicles'].astype(str))
+    print(f"\nBranches with differing totals ({len(mismatches)}):")
+    print('\n'.join(lines))
 
 print("\n" + "=" * 60)
-if row[0] == branch_122['total_vehicles']:
+if mismatches.empty:
     print("VERIFIED: Data matches!")
 else:
     print("Note: Minor differences may exist due to real-time changes")
 print("=" * 60)
-
-conn.close()
-